@@ -1,4 +1,4 @@
 from .config import settings
-from .dependencies import get_ai_service, get_file_processor
+from .dependencies import close_ai_service, get_ai_service, get_file_processor
 
-__all__ = ['settings', 'get_ai_service', 'get_file_processor']
+__all__ = ['settings', 'get_ai_service', 'get_file_processor', 'close_ai_service']
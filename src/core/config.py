@@ -1,56 +1,89 @@
 import os
+from dataclasses import dataclass, field, fields
 
 import dotenv
-from pydantic_settings import BaseSettings
 
-dotenv.load_dotenv()
+ALLOWED_EXTENSIONS = frozenset({
+    'txt',
+    'csv',
+    'json',
+    'md',
+    'py',
+    'js',
+    'ts',
+    'html',
+    'xml',
+    'pdf',
+    'xlsx',
+    'docx',
+    'odt',
+})
 
+# Conversores das variáveis de ambiente, indexados pelo tipo do default do campo
+_ENV_PARSERS = {
+    type(None): str,
+    str: str,
+    int: int,
+    float: float,
+    bool: lambda value: value.lower() == 'true',
+}
 
-class Settings(BaseSettings):
+
+@dataclass(frozen=True, slots=True)
+class Settings:
     """Configurações da aplicação"""
 
     # API configuration
-    base_url: str = os.getenv('BASE_URL')
-    api_key: str = os.getenv('API_KEY')
+    base_url: str | None = None
+    api_key: str | None = None
 
     # File processing configuration
-    max_file_size_mb: int = int(os.getenv('MAX_FILE_SIZE_MB', 10))
-    allowed_extensions: set[str] = {
-        'txt',
-        'csv',
-        'json',
-        'md',
-        'py',
-        'js',
-        'ts',
-        'html',
-        'xml',
-        'pdf',
-        'xlsx',
-        'docx',
-        'odt',
-    }
-    temp_dir: str = os.getenv('TEMP_DIR', '/tmp')
+    max_file_size_mb: int = 10
+    max_file_size_bytes: int = field(init=False, repr=False)
+    allowed_extensions: frozenset[str] = ALLOWED_EXTENSIONS
+    file_concurrency: int = 8
+    temp_dir: str = '/tmp'
 
     # API configuration IA
-    ai_timeout: float = float(os.getenv('AI_TIMEOUT', 60.0))
-    ai_temperature: float = float(os.getenv('AI_TEMPERATURE', 0.6))
-    ai_max_tokens: int = int(os.getenv('AI_MAX_TOKENS', 4000))
-    ai_model: str = os.getenv('AI_MODEL', 'deepseek-reasoner')
+    ai_timeout: float = 60.0
+    ai_temperature: float = 0.6
+    ai_max_tokens: int = 4000
+    ai_model: str = 'deepseek-reasoner'
+    ai_max_connections: int = 100
+    ai_max_keepalive_connections: int = 50
+    ai_keepalive_expiry: float = 30.0
 
     # Server configuration
-    host: str = os.getenv('HOST', '0.0.0.0')
-    port: int = int(os.getenv('PORT', 8000))
-    reload: bool = os.getenv('RELOAD', 'True').lower() == 'true'
-    log_level: str = os.getenv('LOG_LEVEL', 'info')
+    host: str = '0.0.0.0'
+    port: int = 8000
+    reload: bool = True
+    log_level: str = 'info'
+
+    def __post_init__(self):
+        # Calculado uma única vez; a dataclass é congelada
+        object.__setattr__(
+            self, 'max_file_size_bytes', self.max_file_size_mb * 1024 * 1024
+        )
+
+    @classmethod
+    def from_env(cls) -> 'Settings':
+        """
+        Carrega as configurações a partir do .env e das variáveis de ambiente
+
+        Os nomes das variáveis não diferenciam maiúsculas de minúsculas e,
+        quando ausentes, valem os defaults declarados nos campos.
+        """
+        dotenv.load_dotenv()
+        environ = {key.upper(): value for key, value in os.environ.items()}
 
-    @property
-    def max_file_size_bytes(self) -> int:
-        return self.max_file_size_mb * 1024 * 1024
+        values = {}
+        for settings_field in fields(cls):
+            parse = _ENV_PARSERS.get(type(settings_field.default))
+            raw = environ.get(settings_field.name.upper())
+            if settings_field.init and parse and raw is not None:
+                values[settings_field.name] = parse(raw)
 
-    class Config:
-        env_file = '.env'
-        case_sensitive = False
+        return cls(**values)
 
 
-settings = Settings()
+settings = Settings.from_env()
@@ -1,22 +1,38 @@
-from functools import lru_cache
-
 from services.ai_service import AIService
 from services.file_processor import FileProcessorService
 
+_ai_service: AIService | None = None
+_file_processor: FileProcessorService | None = None
+
 
-@lru_cache
 def get_ai_service() -> AIService:
     """
     Dependência singleton para injeção do serviço de IA
-    Usa LRU cache para garantir uma única instância
+    A instância é criada na primeira chamada e reutilizada nas seguintes
+    """
+    global _ai_service
+    if _ai_service is None:
+        _ai_service = AIService()
+    return _ai_service
+
+
+async def close_ai_service() -> None:
+    """
+    Fecha o serviço de IA e descarta o singleton
+    Uma próxima chamada a get_ai_service cria um novo cliente
     """
-    return AIService()
+    global _ai_service
+    if _ai_service is not None:
+        await _ai_service.close()
+        _ai_service = None
 
 
-@lru_cache
 def get_file_processor() -> FileProcessorService:
     """
     Dependência singleton para injeção do processador de arquivos
-    Usa LRU cache para garantir uma única instância
+    A instância é criada na primeira chamada e reutilizada nas seguintes
     """
-    return FileProcessorService()
+    global _file_processor
+    if _file_processor is None:
+        _file_processor = FileProcessorService()
+    return _file_processor
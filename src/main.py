@@ -2,12 +2,13 @@ import logging
 import time
 from contextlib import asynccontextmanager
 
-import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 
 from core.config import settings
-from core.dependencies import get_ai_service
+from core.dependencies import close_ai_service, get_ai_service
 from routes.process import router
 
 # Configuração de logging
@@ -20,30 +21,31 @@ logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
-async def lifespan(app: FastAPI):
+async def lifespan(_app: FastAPI):
     """Gerenciamento do ciclo de vida da aplicação"""
     logger.info('🚀 Iniciando Async AI Processing Service...')
 
     try:
         # Inicializar serviços críticos
-        ai_service = get_ai_service()
+        get_ai_service()
         logger.info('✅ Serviços inicializados com sucesso')
 
         # Validar configurações essenciais
         if not settings.base_url or not settings.api_key:
             raise ValueError('❌ BASE_URL e API_KEY devem estar configurados')
 
-        logger.info(f'🔧 Configurações carregadas - Model: {settings.ai_model}')
-        logger.info(f'📁 Max file size: {settings.max_file_size_mb}MB')
-        logger.info(f'📋 Allowed extensions: {", ".join(settings.allowed_extensions)}')
+        logger.info('🔧 Configurações carregadas - Model: %s', settings.ai_model)
+        logger.info('📁 Max file size: %sMB', settings.max_file_size_mb)
+        logger.info('📋 Allowed extensions: %s', ', '.join(settings.allowed_extensions))
 
     except Exception as e:
-        logger.error(f'❌ Erro ao inicializar serviços: {e}')
+        logger.error('❌ Erro ao inicializar serviços: %s', e)
         raise
 
     yield
 
     logger.info('🛑 Finalizando Async AI Processing Service...')
+    await close_ai_service()
 
 
 # Criar aplicação FastAPI
@@ -56,10 +58,14 @@ app = FastAPI(
     ),
     version='1.0.0',
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     docs_url='/docs',
     redoc_url='/redoc',
 )
 
+# Comprimir respostas grandes (nível 5 equilibra taxa de compressão e CPU)
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Configurar CORS
 app.add_middleware(
     CORSMiddleware,
@@ -73,26 +79,33 @@ app.add_middleware(
 app.include_router(router, prefix='', tags=['API'])
 
 
-# Middleware de logging (opcional)
-@app.middleware('http')
+# Middleware de logging (apenas em modo DEBUG)
 async def log_requests(request, call_next):
     """Middleware para log de requisições"""
-    start_time = time.time()
+    start_time = time.perf_counter()
 
     response = await call_next(request)
 
-    process_time = time.time() - start_time
+    process_time = time.perf_counter() - start_time
     logger.info(
-        f'{request.method} {request.url.path} - '
-        f'Status: {response.status_code} - '
-        f'Time: {process_time:.3f}s'
+        '%s %s - Status: %s - Time: %.3fs',
+        request.method,
+        request.url.path,
+        response.status_code,
+        process_time,
     )
 
     return response
 
 
+if settings.log_level.upper() == 'DEBUG':
+    app.middleware('http')(log_requests)
+
+
 if __name__ == '__main__':
-    logger.info(f'🌐 Iniciando servidor em http://{settings.host}:{settings.port}')
+    import uvicorn
+
+    logger.info('🌐 Iniciando servidor em http://%s:%s', settings.host, settings.port)
 
     uvicorn.run(
         'main:app',
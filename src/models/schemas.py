@@ -2,23 +2,20 @@ from enum import Enum
 
 from pydantic import BaseModel, Field, field_validator
 
+PROMPT_MAX_LENGTH = 2000
 
-class OutputFormat(int, Enum):
-    """Enum para formatos de saída suportados"""
 
-    JSON = 1
-    TEXT = 2
+class OutputFormat(str, Enum):
+    """Enum para formatos de saída suportados"""
 
-    @property
-    def name(self) -> str:
-        names = {1: 'json', 2: 'text'}
-        return names[self.value]
+    JSON = 'json'
+    TEXT = 'text'
 
 
 class PromptRequest(BaseModel):
     """Modelo para requisicao de processamento de prompt"""
 
-    prompt: str = Field(..., min_length=1, max_length=2000)
+    prompt: str = Field(..., min_length=1, max_length=PROMPT_MAX_LENGTH)
     output_format: OutputFormat = Field(default=OutputFormat.TEXT)
 
     @field_validator('prompt')
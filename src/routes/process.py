@@ -1,15 +1,15 @@
 import logging
 import time
-from datetime import datetime
 
 from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
+from fastapi.responses import ORJSONResponse
 
 from core.dependencies import get_ai_service, get_file_processor
 from models.schemas import (
+    PROMPT_MAX_LENGTH,
     ErrorResponse,
     HealthResponse,
     OutputFormat,
-    PromptRequest,
     PromptResponse,
 )
 from services.ai_service import AIService
@@ -21,6 +21,19 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
+def _clean_prompt(prompt: str) -> str:
+    """Remove espaços das extremidades e valida o tamanho do prompt"""
+    prompt = prompt.strip()
+    if not prompt:
+        raise HTTPException(status_code=400, detail='O Prompt não pode estar vazio')
+    if len(prompt) > PROMPT_MAX_LENGTH:
+        raise HTTPException(
+            status_code=400,
+            detail=f'O Prompt deve ter no máximo {PROMPT_MAX_LENGTH} caracteres',
+        )
+    return prompt
+
+
 @router.post(
     '/process',
     response_model=PromptResponse,
@@ -48,7 +61,7 @@ async def process_prompt(
     """Processa um prompt com arquivos opcionais de forma assíncrona.
 
     **Parâmetros:**
-    - **prompt**: Texto do prompt (obrigatório, 1-10000 caracteres)
+    - **prompt**: Texto do prompt (obrigatório, 1-2000 caracteres)
     - **output_format**: Formato da resposta - 'json' ou 'text' (padrão: text)
     - **files**: Lista opcional de arquivos para contexto (max 10MB cada)
 
@@ -64,25 +77,27 @@ async def process_prompt(
     start_time = time.time()
 
     try:
-        # Validar entrada usando Pydantic
-        request_data = PromptRequest(prompt=prompt, output_format=output_format)
+        # Validar entrada
+        prompt = _clean_prompt(prompt)
 
         # Processar arquivos de forma assíncrona (se fornecidos)
-        files_list = files if files else []
-        processed_files, file_content = await file_processor.process_files(files_list)
+        if files:
+            processed_files, file_content = await file_processor.process_files(files)
+        else:
+            processed_files, file_content = [], ''
 
-        logger.info(f'Processando prompt com {len(processed_files)} arquivos')
+        logger.info('Processando prompt com %d arquivos', len(processed_files))
 
         # Gerar completion de forma assíncrona
         result = await ai_service.generate_completion(
-            request_data.prompt, file_content, request_data.output_format
+            prompt, file_content, output_format
         )
 
         processing_time = time.time() - start_time
 
-        logger.info(f'Processamento concluído em {processing_time:.2f}s')
+        logger.info('Processamento concluído em %.2fs', processing_time)
 
-        return PromptResponse(
+        response = PromptResponse(
             success=True,
             data=result,
             files_processed=processed_files,
@@ -90,6 +105,10 @@ async def process_prompt(
             message='Processamento concluído com sucesso',
         )
 
+        # Retornar a resposta já serializável evita que o FastAPI revalide o
+        # modelo contra o response_model (que continua documentando o schema)
+        return ORJSONResponse(content=response.model_dump(mode='python'))
+
     except HTTPException:
         # Re-raise HTTP exceptions (já tratadas nos serviços)
         raise
@@ -110,7 +129,7 @@ async def health_check():
     return HealthResponse(
         status='healthy',
         service='async-ai-processing',
-        timestamp=datetime.utcnow().isoformat(),
+        timestamp=time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
     )
 
 
@@ -1,7 +1,7 @@
-import json
 import logging
 import re
 
+import orjson
 from fastapi import HTTPException
 
 from core.config import settings
@@ -9,36 +9,159 @@ from models.schemas import OutputFormat
 
 logger = logging.getLogger(__name__)
 
+_JSON_SUFFIX = (
+    '\n\nIMPORTANTE: Responda apenas com um JSON válido, '
+    'sem texto adicional antes ou depois do JSON.'
+)
+
+
+# Profundidade máxima de aninhamento coberta pela antiga regex de extração
+_SHALLOW_OBJECT_HEIGHT = 3
+
+# Caracteres estruturais da varredura de objetos (classe simples, sem backtracking)
+_STRUCTURAL_CHARS = re.compile(r'[{}"\\]')
+
+
+def _outermost(spans: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    """Mantém apenas os intervalos que não estão contidos em outro da lista"""
+    result = []
+    covered_until = -1
+    for start, end in sorted(spans):
+        if start > covered_until:
+            result.append((start, end))
+            covered_until = end
+    return result
+
+
+def _string_aware_spans(tokens: list[tuple[int, str]]) -> list[tuple[int, int]]:
+    """Blocos '{...}' de nível superior, ignorando chaves dentro de strings JSON"""
+    spans = []
+    depth = 0
+    start = 0
+    in_string = False
+    escaped_at = -1
+
+    for index, char in tokens:
+        if in_string:
+            if escaped_at == index - 1:
+                # Caractere escapado por uma barra imediatamente anterior
+                escaped_at = -1
+            elif char == '\\':
+                escaped_at = index
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = depth > 0
+        elif char == '{':
+            if depth == 0:
+                start = index
+            depth += 1
+        elif char == '}' and depth:
+            depth -= 1
+            if depth == 0:
+                spans.append((start, index + 1))
+
+    return spans
+
+
+def _find_object_spans(content: str) -> list[tuple[int, int]]:
+    """
+    Retorna, em ordem de posição, os intervalos (início, fim) candidatos a
+    objeto JSON dentro do texto.
+
+    As chaves são casadas com uma pilha, então uma '{' solta na prosa não
+    impede os blocos seguintes. Os candidatos são os pares mais externos, os
+    mais externos com até três níveis de aninhamento (o que a antiga regex
+    encontrava) e os blocos da varredura que respeita strings. Cada família é
+    formada por intervalos disjuntos, logo filtrar e decodificar todos é O(n).
+    """
+    tokens = [
+        (match.start(), match.group()) for match in _STRUCTURAL_CHARS.finditer(content)
+    ]
+    pairs = []
+    stack = []  # [início, maior altura entre os filhos]
+
+    for index, char in tokens:
+        if char == '{':
+            stack.append([index, 0])
+        elif char == '}' and stack:
+            start, child_height = stack.pop()
+            height = child_height + 1
+            if stack and stack[-1][1] < height:
+                stack[-1][1] = height
+            pairs.append((start, index + 1, height))
+
+    candidates = set(_outermost([(start, end) for start, end, _ in pairs]))
+    candidates.update(
+        _outermost([
+            (start, end)
+            for start, end, height in pairs
+            if height <= _SHALLOW_OBJECT_HEIGHT
+        ])
+    )
+    candidates.update(_string_aware_spans(tokens))
+
+    # Um objeto JSON só pode começar com '{"' ou '{}' (após espaços)
+    return sorted(
+        (
+            (start, end)
+            for start, end in candidates
+            if content[start + 1 : end].lstrip()[:1] in ('"', '}')
+        ),
+        key=lambda span: (span[0], -span[1]),
+    )
+
 
 class AIService:
     """Servico responsavel pela comunicacao da API de IA"""
 
     def __init__(self):
         self.client = None
+        self._create_completion = None
+        self._model = settings.ai_model
+        self._temperature = settings.ai_temperature
+        self._max_tokens = settings.ai_max_tokens
         self._initialize_client()
 
     def _initialize_client(self):
         try:
-            from openai import AsyncOpenAI
+            import httpx
+            from openai import AsyncOpenAI, DefaultAsyncHttpxClient
 
             if not settings.base_url or not settings.api_key:
                 raise ValueError('BASE_URL e API_KEY devem ser configurados.')
 
+            # Pool de conexões reutilizado entre as requisições à API de IA
+            http_client = DefaultAsyncHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=settings.ai_max_connections,
+                    max_keepalive_connections=settings.ai_max_keepalive_connections,
+                    keepalive_expiry=settings.ai_keepalive_expiry,
+                ),
+            )
+
             self.client = AsyncOpenAI(
                 base_url=settings.base_url,
                 api_key=settings.api_key,
                 timeout=settings.ai_timeout,
+                http_client=http_client,
             )
+            self._create_completion = self.client.chat.completions.create
 
             logger.info('Cliente OpenAI inicializado com sucesso.')
         except ImportError as e:
-            logger.error(f'Erro ao importar biblioteca OpenAI: {e}')
+            logger.error('Erro ao importar biblioteca OpenAI: %s', e)
         except Exception as e:
-            logger.error(f'Erro ao inicializar cliente OpenAI: {e}')
+            logger.error('Erro ao inicializar cliente OpenAI: %s', e)
             raise ValueError(
                 'Erro ao inicializar cliente OpenAI. Verifique as configurações.'
             )
 
+    async def close(self) -> None:
+        """Fecha o cliente e libera o pool de conexões HTTP"""
+        if self.client:
+            await self.client.close()
+
     async def generate_completion(
         self,
         prompt: str,
@@ -62,37 +185,22 @@ class AIService:
         full_prompt = self._build_full_prompt(prompt, file_content, output_format)
 
         try:
-            response = await self.client.chat.completions.create(
-                model=settings.ai_model,
+            response = await self._create_completion(
+                model=self._model,
                 messages=[{'role': 'user', 'content': full_prompt}],
-                temperature=settings.ai_temperature,
-                max_tokens=settings.ai_max_tokens,
+                temperature=self._temperature,
+                max_tokens=self._max_tokens,
             )
 
-            # Validar se a resposta não é None
-            if response is None:
-                logger.error('Resposta da API é None')
+            # Extrair o conteúdo da primeira choice
+            try:
+                content = response.choices[0].message.content
+            except (IndexError, AttributeError, TypeError) as e:
+                logger.error('Resposta inválida da API: %s', e)
                 raise HTTPException(
                     status_code=500, detail='Resposta inválida da API de IA.'
                 )
 
-            # Validar se há choices na resposta
-            if not hasattr(response, 'choices') or not response.choices:
-                logger.error(f'Resposta sem choices: {response}')
-                raise HTTPException(
-                    status_code=500, detail='Resposta da API não contém choices.'
-                )
-
-            # Validar se a primeira choice tem message
-            if not hasattr(response.choices[0], 'message') or not response.choices[0].message:
-                logger.error(f'Choice sem message: {response.choices[0]}')
-                raise HTTPException(
-                    status_code=500, detail='Resposta da API não contém message.'
-                )
-
-            content = response.choices[0].message.content
-
-            # Validar se o content não é None
             if content is None:
                 logger.error('Content da resposta é None')
                 raise HTTPException(
@@ -107,7 +215,7 @@ class AIService:
             # Re-raise HTTPException sem alterar
             raise
         except Exception as e:
-            logger.error(f'Erro ao gerar completion: {e}')
+            logger.error('Erro ao gerar completion: %s', e)
             raise HTTPException(
                 status_code=500, detail='Erro ao processar solicitação de IA.'
             )
@@ -115,29 +223,27 @@ class AIService:
     def _build_full_prompt(
         self, prompt: str, file_content: str, output_format: OutputFormat
     ) -> str:
-        full_prompt = prompt
+        parts = [prompt]
 
         if file_content:
-            full_prompt += f'\n\nConteúdo do arquivo:\n{file_content}'
+            parts.append('\n\nConteúdo do arquivo:\n')
+            parts.append(file_content)
 
         if output_format == OutputFormat.JSON:
-            full_prompt += """\n\nIMPORTANTE: Responda apenas com um JSON válido,
-            sem texto adicional antes ou depois do JSON."""
+            parts.append(_JSON_SUFFIX)
 
-        return full_prompt
+        return ''.join(parts)
 
     def _parse_json_response(self, content: str) -> dict:
         try:
-            return json.loads(content.strip())
-        except json.JSONDecodeError:
-            json_pattern = r'\{(?:[^{}]|(?:\{(?:[^{}]|\{[^{}]*\})*\}))*\}'
-            json_match = re.search(json_pattern, content, re.DOTALL)
-
-            if json_match:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            # Tentar decodificar cada bloco '{...}' candidato uma única vez
+            for start, end in _find_object_spans(content):
                 try:
-                    return json.loads(json_match.group())
-                except json.JSONDecodeError:
-                    pass
+                    return orjson.loads(content[start:end])
+                except orjson.JSONDecodeError:
+                    continue
 
             # Se não conseguir extrair JSON válido, retornar como texto estruturado
             logger.warning('Não foi possível extrair JSON válido da resposta da IA')
@@ -1,23 +1,25 @@
 import asyncio
+import io
 import logging
-import os
-import tempfile
-from pathlib import Path
+from typing import ClassVar
 
-import aiofiles
 from fastapi import HTTPException, UploadFile
 
 from core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Tamanho do bloco de leitura dos uploads (64 KiB)
+CHUNK_SIZE = 64 * 1024
+
 
 class FileProcessorService:
     """Serviço para processar arquivos enviados"""
 
+    _ALLOWED_EXTENSIONS: ClassVar[frozenset[str]] = settings.allowed_extensions
+
     def __init__(self):
         self.max_file_size = settings.max_file_size_bytes
-        self.allowed_extensions = settings.allowed_extensions
 
     async def process_files(self, files: list[UploadFile]) -> tuple[list[str], str]:
         """
@@ -33,87 +35,98 @@ class FileProcessorService:
         if not files:
             return [], ''
 
-        # validar os arquivos antes do processamento
-        for file in files:
-            self._validate_file(file)
-
-        # processar os arquivos com asyncio.gather
-        tasks = [self._process_single_file(file) for file in files]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        # Limite de leituras simultâneas desta requisição
+        semaphore = asyncio.Semaphore(settings.file_concurrency)
+        tasks = [
+            asyncio.create_task(self._process_single_file(file, semaphore))
+            for file in files
+        ]
 
         processed_files = []
-        combined_content = []
-
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                error_msg = (
-                    f'Erro ao processar o arquivo {files[i].filename}: : {result}'
-                )
-                logger.error(error_msg)
-                raise HTTPException(status_code=400, detail=error_msg)
+        combined_content = io.StringIO()
 
-            filename, content = result
-            processed_files.append(filename)
-            combined_content.append(content)
-
-        return processed_files, '\n'.join(combined_content)
+        try:
+            # Consumir os resultados na ordem de envio, escrevendo cada arquivo no
+            # buffer assim que fica pronto e descartando a referência ao conteúdo
+            for i, file in enumerate(files):
+                task, tasks[i] = tasks[i], None
+                try:
+                    filename, content = await task
+                except ValueError as e:
+                    # Falha de validação do arquivo
+                    error_msg = f'Arquivo {file.filename} rejeitado: {e}'
+                    logger.warning(error_msg)
+                    raise HTTPException(status_code=400, detail=error_msg)
+                except HTTPException as e:
+                    # Erros já tratados no processamento mantêm o status original
+                    error_msg = (
+                        f'Erro ao processar o arquivo {file.filename}: {e.detail}'
+                    )
+                    logger.error(error_msg)
+                    raise HTTPException(status_code=e.status_code, detail=error_msg)
+                except Exception as e:
+                    error_msg = f'Erro ao processar o arquivo {file.filename}: {e}'
+                    logger.error(error_msg)
+                    raise HTTPException(status_code=400, detail=error_msg)
+                del task
+
+                processed_files.append(filename)
+                if i:
+                    combined_content.write('\n')
+                combined_content.write(content)
+                del content
+        finally:
+            # Em caso de erro, cancelar as leituras pendentes e recuperar as
+            # exceções das que já terminaram (evita avisos do asyncio)
+            for task in tasks:
+                if task is None:
+                    continue
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    task.exception()
+
+        return processed_files, combined_content.getvalue()
 
     def _validate_file(self, file: UploadFile) -> None:
-        """Valida o arquivo enviado"""
+        """Valida o arquivo enviado, levantando ValueError se for inválido"""
 
         if not file.filename:
-            raise HTTPException(
-                status_code=400, detail='Nome do arquivo não pode ser vazio.'
-            )
-
-        file_extension = Path(file.filename).suffix.lower().lstrip('.')
-        if file_extension not in self.allowed_extensions:
-            raise HTTPException(
-                status_code=400,
-                detail=f'Tipo de arquivo não permitido: {file_extension}. ',
-            )
-
-    async def _process_single_file(self, file: UploadFile) -> tuple[str, str]:
+            raise ValueError('Nome do arquivo não pode ser vazio.')
+
+        _, dot, file_extension = file.filename.rpartition('.')
+        file_extension = file_extension.lower() if dot else ''
+        if file_extension not in self._ALLOWED_EXTENSIONS:
+            raise ValueError(f'Tipo de arquivo não permitido: {file_extension}.')
+
+    async def _process_single_file(
+        self, file: UploadFile, semaphore: asyncio.Semaphore
+    ) -> tuple[str, str]:
         """Processa um único arquivo"""
 
-        try:
-            # Criar arquivo temporário
-            with tempfile.NamedTemporaryFile(
-                delete=False, suffix=Path(file.filename).suffix
-            ) as temp_file:
-                temp_path = temp_file.name
-
-            # valida o tamanho do arquivo
-            content = await file.read()
-            if len(content) > self.max_file_size:
+        self._validate_file(file)
+
+        async with semaphore:
+            try:
+                # Ler o arquivo em blocos, validando o tamanho incrementalmente
+                max_size = self.max_file_size
+                size = 0
+                chunks = []
+                while chunk := await file.read(CHUNK_SIZE):
+                    size += len(chunk)
+                    if size > max_size:
+                        raise HTTPException(
+                            status_code=400,
+                            detail='Tamanho do arquivo excede o limite permitido.',
+                        )
+                    chunks.append(chunk)
+
+                return file.filename, b''.join(chunks).decode('utf-8', errors='ignore')
+
+            except HTTPException:
+                raise
+            except Exception as e:
+                logger.error('Erro ao processar o arquivo %s: %s', file.filename, e)
                 raise HTTPException(
-                    status_code=400,
-                    detail='Tamanho do arquivo excede o limite permitido.',
+                    status_code=500, detail='Erro interno ao processar o arquivo.'
                 )
-
-            # escrever o conteudo para o arquivo temporario
-            async with aiofiles.open(temp_path, 'wb') as f:
-                await f.write(content)
-
-            # Ler conteúdo como texto
-            async with aiofiles.open(
-                temp_path, encoding='utf-8', errors='ignore'
-            ) as f:
-                file_content = await f.read()
-
-            return file.filename, file_content
-
-        except Exception as e:
-            logger.error(f'Erro ao processar o arquivo {file.filename}: {e}')
-            raise HTTPException(
-                status_code=500, detail='Erro interno ao processar o arquivo.'
-            )
-        finally:
-            # Remover os arquivos temporarios
-            if temp_path and os.path.exists(temp_path):
-                try:
-                    os.unlink(temp_path)
-                except OSError as e:
-                    logger.warning(
-                        f'Erro ao remover arquivo temporário {temp_path}: {e}'
-                    )